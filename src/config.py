@@ -1 +1,16 @@
 # Global Config
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# BNetzA Ladesäulenregister (full export), with the small sample in data/ as fallback
+REGISTER_PATH = os.path.join(PROJECT_ROOT, "src", "maintenance", "infrastructure", "datasets", "Ladesaeulenregister.csv")
+SAMPLE_REGISTER_PATH = os.path.join(PROJECT_ROOT, "data", "Ladesaeulenregister.csv")
+
+
+def default_register_path() -> str:
+    """The register the build and the dashboard use unless told otherwise."""
+    return REGISTER_PATH if os.path.exists(REGISTER_PATH) else SAMPLE_REGISTER_PATH
+
+# Output of `python -m src.main build`, loaded by the dashboard at startup
+ARTIFACT_DIR = os.path.join(PROJECT_ROOT, "artifacts")
@@ -1 +1,61 @@
 # Entry Point
+"""
+Command line entry point.
+
+    python -m src.main build [--register CSV] [--out DIR] [--workers N] [--force]
+
+`build` runs the offline precompute DAG (register parsing, PLZ/Bezirk
+assignment, traffic join, population aggregates, search and spatial
+indexes) and publishes a versioned artifact directory that the dashboard
+loads at startup.
+"""
+import argparse
+import os
+import sys
+
+from src import config
+
+
+def cmd_build(options) -> int:
+    from src.shared.infrastructure.precompute.pipeline import build, default_datasets
+
+    register = options.register or config.default_register_path()
+    if not os.path.exists(register):
+        print(f"❌ Register not found: {register}")
+        return 1
+
+    print(f"⚡ Building artifacts from {register}")
+    try:
+        manifest = build(default_datasets(register), options.out, workers=options.workers,
+                         force=options.force, keep=options.keep)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    rebuilt = [name for name, s in manifest["stages"].items() if not s["reused"]]
+    print(f"✅ Version {manifest['version']} -> {os.path.join(options.out, manifest['version'])}"
+          f" ({len(rebuilt)} of {len(manifest['stages'])} stages rebuilt)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="ChargeHub Berlin command line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="precompute data artifacts for the dashboard")
+    build_cmd.add_argument("--register", help="Ladesäulenregister CSV (default: the full export, else data/ sample)")
+    build_cmd.add_argument("--out", default=config.ARTIFACT_DIR, help="artifact directory")
+    build_cmd.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    build_cmd.add_argument("--force", action="store_true", help="rebuild every stage even if inputs are unchanged")
+    build_cmd.add_argument("--keep", type=int, default=5, help="number of artifact versions to keep")
+    build_cmd.set_defaults(func=cmd_build)
+    return parser
+
+
+def main(argv=None) -> int:
+    options = build_parser().parse_args(argv)
+    return options.func(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
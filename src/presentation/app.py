@@ -1,9 +1,9 @@
 import sys
 import os
 import streamlit as st
-import pandas as pd
-import pydeck as pdk
 import random
+import uuid
+from datetime import datetime, timedelta
 
 # ==========================================
 # 🚨 PATH & DATA SETUP
@@ -13,57 +13,88 @@ project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-CSV_PATH = os.path.join(project_root, "src", "maintenance", "infrastructure", "datasets", "Ladesaeulenregister.csv")
-
 try:
     from src.shared.application.services.malfunction_service import MalfunctionService
+    from src.shared.application.services.malfunction_intake import MalfunctionIntake
+    from src.shared.application.services.malfunction_history import MalfunctionHistory
+    from src.shared.infrastructure.repositories.station_register import load_berlin_stations
+    from src.shared.infrastructure.precompute.artifacts import latest_version, load_latest
+    from src.config import ARTIFACT_DIR, default_register_path
 except ImportError:
     st.error("❌ System Error: Internal modules not found.")
     st.stop()
 
+# Same register the offline build uses by default: the full export, else the data/ sample
+CSV_PATH = default_register_path()
+
+def register_stamp(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+@st.cache_resource
+def get_artifacts(version, register):
+    # Keyed on LATEST and the register's stat: a new build or a new register re-validates
+    return load_latest(ARTIFACT_DIR, register_path=CSV_PATH)
+
 @st.cache_data
-def get_berlin_data(_path):
+def get_berlin_data(_path, _artifacts=None, artifact_version=None):
+    # Prefer the precomputed build (`python -m src.main build`) over parsing the CSV
+    if _artifacts is not None:
+        return _artifacts.stations()
     try:
-        # Load using German CSV standards
-        df = pd.read_csv(_path, sep=';', encoding='utf-8', low_memory=False)
-        df.columns = df.columns.str.strip()
-        
-        data = []
-        zip_counters = {} 
-        
-        for i, row in df.iterrows():
-            lat_str = str(row.get('Breitengrad', '0')).replace(',', '.').strip(' .')
-            lon_str = str(row.get('Längengrad', '0')).replace(',', '.').strip(' .')
-            
-            try:
-                lat, lon = float(lat_str), float(lon_str)
-                # Geographic Authentication: Filter for Berlin Bounding Box
-                if 52.3 <= lat <= 52.7 and 13.0 <= lon <= 13.8:
-                    zip_val = str(row.get('Postleitzahl', '')).split('.')[0].zfill(5) if pd.notna(row.get('Postleitzahl')) else "00000"
-                    
-                    zip_counters[zip_val] = zip_counters.get(zip_val, 0) + 1
-                    serial_no = zip_counters[zip_val]
-                    station_id = f"BER-{zip_val}-{serial_no}"
-                    
-                    data.append({
-                        "lat": lat, "lon": lon,
-                        "operator": str(row.get('Betreiber', 'Unknown')).strip(),
-                        "station_id": station_id,
-                        "zip": zip_val,
-                        "street": str(row.get('Straße', 'Unknown')).strip()
-                    })
-            except: continue
-        return data
+        return load_berlin_stations(_path)
     except Exception as e:
         st.error(f"Error loading CSV data: {e}")
         return []
 
+@st.cache_resource
+def get_malfunction_intake(_all_data, data_version=None):
+    # One intake shared by every session so coalescing and rate limits see all traffic.
+    # Keyed on the data version so a new build brings fresh operator/Bezirk dimensions.
+    station_dims = {s['station_id']: {"operator": s['operator'], "plz": s['zip'], "bezirk": s.get('bezirk')} for s in _all_data}
+    history = MalfunctionHistory(station_dimensions=lambda sid: station_dims.get(sid, {}))
+    return MalfunctionIntake(MalfunctionService(history=history))
+
+def render_reliability(history):
+    import pandas as pd
+    st.markdown("### 📈 Reliability (last 30 days)")
+    since = datetime.now() - timedelta(days=30)
+    dimension = st.radio("Group by", ["operator", "plz", "bezirk"], horizontal=True)
+    summary = history.summary(dimension, start=since)
+    open_now = history.open_summary(dimension)
+    rows = [{
+        dimension.upper(): value,
+        "Reports": totals['reported'], "Tickets": totals['opened'], "Resolved": totals['resolved'],
+        "MTTR (h)": totals['mttr_hours'],
+        "Open": open_now.get(value, {}).get('open', 0),
+        "Mean Open Age (h)": open_now.get(value, {}).get('mean_age_hours'),
+    } for value, totals in summary.items()]
+    if rows:
+        st.dataframe(pd.DataFrame(rows).sort_values("Reports", ascending=False), use_container_width=True)
+        daily = pd.DataFrame(history.series("all", "Berlin", granularity="day", start=since))
+        st.bar_chart(daily.set_index("bucket")[["reported", "resolved"]])
+    else:
+        st.info("No malfunction activity in the last 30 days.")
+
 def main():
+    # pandas/pydeck are only needed once we render, keep module import cheap
+    import pandas as pd
+    import pydeck as pdk
+
     st.set_page_config(page_title="ChargeHub Berlin", layout="wide")
     st.title("⚡ ChargeHub Berlin (v8.6)")
 
-    malfunction_service = MalfunctionService()
-    all_data = get_berlin_data(CSV_PATH)
+    artifacts = get_artifacts(latest_version(ARTIFACT_DIR), register_stamp(CSV_PATH))
+    data_version = artifacts.version if artifacts else None
+    all_data = get_berlin_data(CSV_PATH, artifacts, data_version)
+    malfunction_intake = get_malfunction_intake(all_data, data_version)
+    malfunction_intake.flush_if_due()
+    malfunction_service = malfunction_intake.service
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
     
     # 🗝️ AUTHENTICATION: Get list of valid Berlin ZIP codes from dataset
     valid_berlin_zips = sorted(list({s['zip'] for s in all_data if s['zip'] != "00000"}))
@@ -103,7 +134,7 @@ def main():
         
         temp_list = []
         for s in display_list:
-            is_broken = malfunction_service.is_station_broken(s['station_id'])
+            is_broken = malfunction_intake.is_station_broken(s['station_id'])
             status = "Not Available" if is_broken else "Available"
             if status in status_filter:
                 s_copy = s.copy()
@@ -150,12 +181,14 @@ def main():
             if st.form_submit_button("🚨 Submit"):
                 valid_ids = {s['station_id'] for s in all_data}
                 if station_id_input.strip() not in valid_ids: st.error("❌ Invalid ID.")
+                elif not malfunction_intake.submit(station_id_input.strip(), issue_type, st.session_state['session_id']):
+                    st.error("⏳ Too many reports right now. Please try again in a minute.")
                 else:
-                    malfunction_service.report_malfunction(station_id_input.strip(), issue_type)
                     st.session_state['success_msg'] = f"✅ Reported {station_id_input}!"
                     st.rerun()
     else:
         st.sidebar.warning("🔒 Admin Mode")
+        malfunction_intake.flush()
         reports = malfunction_service.get_all_reports()
         if reports:
             rep_df = pd.DataFrame(reports)
@@ -163,8 +196,9 @@ def main():
             st.dataframe(rep_df.style.applymap(lambda v: 'color: #e74c3c; font-weight: bold' if v == 'Open' else '', subset=['status']), use_container_width=True)
             fix_id = st.selectbox("Resolve ID", rep_df['station_id'].tolist())
             if st.button("Mark Fixed"):
-                malfunction_service.resolve_malfunction(fix_id)
+                malfunction_intake.resolve(fix_id)
                 st.session_state['success_msg'] = f"✅ Station {fix_id} resolved."
                 st.rerun()
+        render_reliability(malfunction_service.history)
 
 if __name__ == "__main__": main()
\ No newline at end of file
@@ -0,0 +1,218 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+GRANULARITIES = {
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+}
+DIMENSIONS = ("all", "operator", "plz", "bezirk")
+_STATION_ID_PLZ = re.compile(r"^BER-(\d{5})-")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    granularity TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    reported INTEGER NOT NULL DEFAULT 0,
+    opened INTEGER NOT NULL DEFAULT 0,
+    resolved INTEGER NOT NULL DEFAULT 0,
+    repair_seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, dimension, value, bucket)
+);
+CREATE TABLE IF NOT EXISTS open_reports (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    sum_ts REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, value)
+);
+"""
+
+_ADD_TO_BUCKET = """
+INSERT INTO buckets (granularity, dimension, value, bucket, reported, opened, resolved, repair_seconds)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (granularity, dimension, value, bucket) DO UPDATE SET
+    reported = reported + excluded.reported,
+    opened = opened + excluded.opened,
+    resolved = resolved + excluded.resolved,
+    repair_seconds = repair_seconds + excluded.repair_seconds
+"""
+
+_OPEN_REPORT = """
+INSERT INTO open_reports (dimension, value, count, sum_ts) VALUES (?, ?, 1, ?)
+ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1, sum_ts = sum_ts + excluded.sum_ts
+"""
+
+_CLOSE_REPORT = """
+UPDATE open_reports SET
+    sum_ts = CASE WHEN count <= 1 THEN 0 ELSE sum_ts - ? END,
+    count = MAX(count - 1, 0)
+WHERE dimension = ? AND value = ? AND count > 0
+"""
+
+
+def default_station_dimensions(station_id: str) -> Dict[str, str]:
+    """Best effort: our IDs are BER-[PLZ]-[Serial], so the PLZ is always known."""
+    match = _STATION_ID_PLZ.match(station_id)
+    return {
+        "operator": "Unknown",
+        "plz": match.group(1) if match else "Unknown",
+        "bezirk": "Unknown",
+    }
+
+
+class MalfunctionHistory:
+    """
+    Keeps resolved reports and incrementally maintained rollups.
+    - history: append-only JSON lines file of resolved reports
+    - rollups: SQLite table of per granularity (hour/day), per dimension
+      (operator/PLZ/Bezirk) counters for reported/opened/resolved and total
+      repair time, plus the currently open reports (count + summed open
+      time, for the mean age).
+    Each event only upserts its own buckets, so the cost of recording does
+    not grow with the amount of history. Dashboards read the rollups only;
+    the raw history is never rescanned.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "src/maintenance/infrastructure/datasets",
+        station_dimensions: Callable[[str], Dict[str, str]] = default_station_dimensions,
+    ):
+        self.history_path = os.path.join(data_dir, "malfunction_history.jsonl")
+        self.rollup_path = os.path.join(data_dir, "malfunction_rollups.sqlite3")
+        self.station_dimensions = station_dimensions
+        self._lock = threading.Lock()
+        os.makedirs(data_dir, exist_ok=True)
+        # Shared by the Streamlit session threads, serialized through self._lock
+        self._db = sqlite3.connect(self.rollup_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    # ---------- Events ----------
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM buckets LIMIT 1").fetchone() is None
+
+    def record_reported(self, events: List[dict]):
+        """
+        events: dicts with station_id, timestamp, count and opened
+        (True when the report created a new open ticket, False when it was
+        folded into an existing one).
+        """
+        if not events:
+            return
+        bucket_rows, open_rows = [], []
+        for e in events:
+            ts = datetime.fromisoformat(e["timestamp"])
+            opened = 1 if e.get("opened", True) else 0
+            for dim, value in self._dimensions(e["station_id"]).items():
+                for granularity, fmt in GRANULARITIES.items():
+                    bucket_rows.append((granularity, dim, value, ts.strftime(fmt), e.get("count", 1), opened, 0, 0.0))
+                if opened:
+                    open_rows.append((dim, value, ts.timestamp()))
+        with self._lock, self._db:
+            self._db.executemany(_ADD_TO_BUCKET, bucket_rows)
+            self._db.executemany(_OPEN_REPORT, open_rows)
+
+    def record_resolved(self, reports: List[dict], resolved_at: Optional[datetime] = None):
+        """Moves resolved reports into the history and updates MTTR buckets."""
+        if not reports:
+            return
+        resolved_at = resolved_at or datetime.now()
+        bucket_rows, close_rows = [], []
+        for r in reports:
+            opened_at = datetime.fromisoformat(r["timestamp"])
+            repair_seconds = max((resolved_at - opened_at).total_seconds(), 0.0)
+            for dim, value in self._dimensions(r["station_id"]).items():
+                for granularity, fmt in GRANULARITIES.items():
+                    bucket_rows.append((granularity, dim, value, resolved_at.strftime(fmt), 0, 0, 1, repair_seconds))
+                close_rows.append((opened_at.timestamp(), dim, value))
+
+        with self._lock:
+            with open(self.history_path, "a") as f:
+                for r in reports:
+                    entry = dict(r, status="Resolved", resolved_at=resolved_at.isoformat())
+                    f.write(json.dumps(entry) + "\n")
+            with self._db:
+                self._db.executemany(_ADD_TO_BUCKET, bucket_rows)
+                self._db.executemany(_CLOSE_REPORT, close_rows)
+
+    # ---------- Queries ----------
+
+    def series(self, dimension: str, value: str, granularity: str = "day",
+               start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[dict]:
+        """Time-ordered buckets for one operator/PLZ/Bezirk (value) in [start, end]."""
+        lo, hi = self._range(granularity, start, end)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT bucket, reported, opened, resolved, repair_seconds FROM buckets "
+                "WHERE granularity = ? AND dimension = ? AND value = ? AND bucket BETWEEN ? AND ? "
+                "ORDER BY bucket",
+                (granularity, dimension, value, lo, hi),
+            ).fetchall()
+        return [
+            {"reported": reported, "opened": opened, "resolved": resolved, "repair_seconds": repair, "bucket": bucket}
+            for bucket, reported, opened, resolved, repair in rows
+        ]
+
+    def summary(self, dimension: str, granularity: str = "day",
+                start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, dict]:
+        """Totals and MTTR (hours) per value of a dimension over [start, end]."""
+        lo, hi = self._range(granularity, start, end)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT value, SUM(reported), SUM(opened), SUM(resolved), SUM(repair_seconds) FROM buckets "
+                "WHERE granularity = ? AND dimension = ? AND bucket BETWEEN ? AND ? "
+                "GROUP BY value HAVING SUM(reported) > 0 OR SUM(resolved) > 0",
+                (granularity, dimension, lo, hi),
+            ).fetchall()
+        return {
+            value: {
+                "reported": reported, "opened": opened, "resolved": resolved, "repair_seconds": repair,
+                "mttr_hours": round(repair / resolved / 3600, 2) if resolved else None,
+            }
+            for value, reported, opened, resolved, repair in rows
+        }
+
+    def open_summary(self, dimension: str, now: Optional[datetime] = None) -> Dict[str, dict]:
+        """Open reports per value with their mean age in hours."""
+        now_ts = (now or datetime.now()).timestamp()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT value, count, sum_ts FROM open_reports WHERE dimension = ? AND count > 0", (dimension,)
+            ).fetchall()
+        return {
+            value: {"open": count, "mean_age_hours": round((now_ts - sum_ts / count) / 3600, 2)}
+            for value, count, sum_ts in rows
+        }
+
+    def get_history(self) -> List[dict]:
+        """All resolved reports (raw). Dashboards should prefer series/summary."""
+        if not os.path.exists(self.history_path):
+            return []
+        with open(self.history_path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    # ---------- Internals ----------
+
+    def _dimensions(self, station_id: str) -> Dict[str, str]:
+        dims = self.station_dimensions(station_id) or {}
+        result = {"all": "Berlin"}
+        for dim in DIMENSIONS[1:]:
+            result[dim] = str(dims.get(dim) or "Unknown")
+        return result
+
+    @staticmethod
+    def _range(granularity: str, start: Optional[datetime], end: Optional[datetime]):
+        # Bucket keys sort chronologically as strings; "~" sorts after any digit
+        fmt = GRANULARITIES[granularity]
+        return (start.strftime(fmt) if start else "", end.strftime(fmt) if end else "~")
@@ -0,0 +1,200 @@
+import atexit
+import threading
+import weakref
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from src.shared.application.services.malfunction_service import MalfunctionService
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens, refilled at `rate` per second."""
+
+    def __init__(self, capacity: float, rate: float, now: datetime):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: datetime):
+        elapsed = max((now - self.updated).total_seconds(), 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def is_full(self, now: datetime) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def has_token(self, now: datetime) -> bool:
+        self._refill(now)
+        return self.tokens >= 1
+
+    def take(self, now: datetime) -> bool:
+        if not self.has_token(now):
+            return False
+        self.tokens -= 1
+        return True
+
+
+class MalfunctionIntake:
+    """
+    Sits in front of MalfunctionService so bursts of reports don't rewrite
+    the JSON store on every click:
+    - reports for the same station + issue inside `window_seconds` are
+      coalesced into one report with a `count`,
+    - each session and each station draws from its own token bucket,
+    - accepted reports are written in micro-batches: when the batch is
+      full, or at the latest `flush_interval` seconds after the first
+      queued report (background timer), and once more at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        service: MalfunctionService,
+        window_seconds: float = 600,
+        batch_size: int = 20,
+        flush_interval: float = 2.0,
+        station_capacity: float = 3,
+        station_rate: float = 1 / 60,
+        session_capacity: float = 5,
+        session_rate: float = 1 / 30,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.service = service
+        self.window_seconds = window_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.station_limits = (station_capacity, station_rate)
+        self.session_limits = (session_capacity, session_rate)
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], dict] = {}
+        self._oldest_pending: Optional[datetime] = None
+        self._timer: Optional[threading.Timer] = None
+        self._station_buckets: Dict[str, TokenBucket] = {}
+        self._session_buckets: Dict[str, TokenBucket] = {}
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def submit(self, station_id: str, description: str, session_id: str = "anonymous") -> bool:
+        """Queues a report. Returns False if it was rate limited."""
+        with self._lock:
+            now = self.clock()
+            session_bucket = self._bucket(self._session_buckets, session_id, self.session_limits, now)
+            if not session_bucket.has_token(now):
+                return False
+
+            key = (station_id, description)
+            pending = self._pending.get(key)
+            if pending is not None and (now - datetime.fromisoformat(pending["last_reported"])).total_seconds() <= self.window_seconds:
+                # Duplicate of a queued report: bump the counter, no new row
+                session_bucket.take(now)
+                pending["count"] += 1
+                pending["last_reported"] = now.isoformat()
+            else:
+                station_bucket = self._bucket(self._station_buckets, station_id, self.station_limits, now)
+                if not station_bucket.has_token(now):
+                    return False
+                if pending is not None:
+                    # Queued report fell out of the window: persist it before starting a new one
+                    self._flush_locked(now)
+                session_bucket.take(now)
+                station_bucket.take(now)
+                self._pending[key] = {
+                    "station_id": station_id,
+                    "description": description,
+                    "timestamp": now.isoformat(),
+                    "last_reported": now.isoformat(),
+                    "count": 1,
+                    "status": "Open",
+                }
+                if self._oldest_pending is None:
+                    self._oldest_pending = now
+                    self._arm_timer()
+
+            if self._is_due(now):
+                self._flush_locked(now)
+            return True
+
+    def flush_if_due(self):
+        with self._lock:
+            now = self.clock()
+            if self._is_due(now):
+                self._flush_locked(now)
+
+    def flush(self):
+        """Writes every queued report to storage in a single batch."""
+        with self._lock:
+            self._flush_locked(self.clock())
+
+    def resolve(self, station_id: str):
+        """Resolves a station, including reports still queued for it. Runs under
+        the intake lock so it never interleaves with a batch write."""
+        with self._lock:
+            now = self.clock()
+            self._flush_locked(now)
+            self.service.resolve_malfunction(station_id)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def is_station_broken(self, station_id: str) -> bool:
+        """Like MalfunctionService.is_station_broken, but also sees queued reports."""
+        with self._lock:
+            if any(key[0] == station_id for key in self._pending):
+                return True
+        return self.service.is_station_broken(station_id)
+
+    def _is_due(self, now: datetime) -> bool:
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.batch_size:
+            return True
+        return (now - self._oldest_pending).total_seconds() >= self.flush_interval
+
+    def _flush_locked(self, now: datetime):
+        if self._pending:
+            batch = sorted(self._pending.values(), key=lambda r: r["timestamp"])
+            self.service.merge_reports(batch, window_seconds=self.window_seconds)
+            self._pending = {}
+            self._oldest_pending = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._prune_buckets(now)
+
+    def _arm_timer(self):
+        # Nothing else may call us again (the app reruns only on interaction),
+        # so the queue must not depend on a later submit to reach storage
+        self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+            try:
+                self._flush_locked(self.clock())
+            except Exception:
+                # The reports are still queued and no submit will re-arm us
+                self._arm_timer()
+                raise
+
+    def _bucket(self, buckets: Dict[str, TokenBucket], key: str, limits, now: datetime) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(limits[0], limits[1], now)
+        return bucket
+
+    def _prune_buckets(self, now: datetime):
+        # A full bucket behaves exactly like a fresh one, so it can be dropped
+        for buckets in (self._station_buckets, self._session_buckets):
+            for key in [k for k, b in buckets.items() if b.is_full(now)]:
+                del buckets[key]
+
+
+def _flush_at_exit(intake_ref):
+    intake = intake_ref()
+    if intake is not None:
+        intake.flush()
@@ -1,11 +1,22 @@
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 
 class MalfunctionService:
-    def __init__(self, data_path="src/maintenance/infrastructure/datasets/malfunctions.json"):
+    def __init__(self, data_path="src/maintenance/infrastructure/datasets/malfunctions.json", history=None):
         self.data_path = data_path
+        self.history = history
+        # Serializes read-modify-write of the store together with the history
+        # events it produces, so history is never recorded from a stale read
+        self._lock = threading.RLock()
         self._ensure_file_exists()
+        if self.history is not None and self.history.is_empty():
+            # First run with a history store: seed it with what is already open
+            self.history.record_reported([
+                {"station_id": r["station_id"], "timestamp": r["timestamp"], "count": r.get("count", 1), "opened": True}
+                for r in self.get_all_reports()
+            ])
 
     def _ensure_file_exists(self):
         if not os.path.exists(os.path.dirname(self.data_path)):
@@ -16,20 +27,58 @@ class MalfunctionService:
                 json.dump([], f)
 
     def report_malfunction(self, station_id: str, description: str):
-        reports = self.get_all_reports()
-        new_report = {
-            "station_id": station_id,
-            "description": description,
-            "timestamp": datetime.now().isoformat(),
-            "status": "Open"
-        }
-        reports.append(new_report)
-        self._save_reports(reports)
+        with self._lock:
+            reports = self.get_all_reports()
+            new_report = {
+                "station_id": station_id,
+                "description": description,
+                "timestamp": datetime.now().isoformat(),
+                "status": "Open"
+            }
+            reports.append(new_report)
+            self._save_reports(reports)
+            self._record_reported([dict(new_report, opened=True)])
+
+    def merge_reports(self, incoming, window_seconds: float = 0):
+        """Writes a batch of reports in one pass, folding each into an open
+        report for the same station and issue seen within `window_seconds`."""
+        if not incoming:
+            return
+        with self._lock:
+            reports = self.get_all_reports()
+            window = timedelta(seconds=window_seconds)
+            events = []
+            latest = {}
+            for r in reports:
+                if r.get("status", "Open") == "Open":
+                    latest[(r["station_id"], r["description"])] = r
+
+            for new in incoming:
+                key = (new["station_id"], new["description"])
+                existing = latest.get(key)
+                if existing is not None:
+                    last_seen = datetime.fromisoformat(existing.get("last_reported", existing["timestamp"]))
+                    if datetime.fromisoformat(new["timestamp"]) - last_seen <= window:
+                        existing["count"] = existing.get("count", 1) + new.get("count", 1)
+                        existing["last_reported"] = max(existing.get("last_reported", existing["timestamp"]), new.get("last_reported", new["timestamp"]))
+                        events.append(dict(new, opened=False))
+                        continue
+                report = dict(new)
+                reports.append(report)
+                latest[key] = report
+                events.append(dict(new, opened=True))
+            self._save_reports(reports)
+            self._record_reported(events)
 
     def resolve_malfunction(self, station_id: str):
-        reports = self.get_all_reports()
-        active_reports = [r for r in reports if r["station_id"] != station_id]
-        self._save_reports(active_reports)
+        with self._lock:
+            reports = self.get_all_reports()
+            resolved = [r for r in reports if r["station_id"] == station_id]
+            if not resolved:
+                return
+            self._save_reports([r for r in reports if r["station_id"] != station_id])
+            if self.history is not None:
+                self.history.record_resolved(resolved)
 
     def get_all_reports(self):
         try:
@@ -45,6 +94,13 @@ class MalfunctionService:
                 return True
         return False
 
+    def _record_reported(self, events):
+        if self.history is not None:
+            self.history.record_reported(events)
+
     def _save_reports(self, reports):
-        with open(self.data_path, 'w') as f:
+        # Write aside and swap in, so readers never see a half-written file
+        tmp_path = f"{self.data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(reports, f, indent=4)
+        os.replace(tmp_path, self.data_path)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+# Kept free of the build machinery (process pool, stages, dataset loaders):
+# this module is imported by the dashboard at startup.
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def latest_version(out_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(out_dir, LATEST_FILE), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def matches_register(manifest: dict, register_path: str) -> bool:
+    """True if the build was made from a register with this file's content."""
+    entry = manifest.get("datasets", {}).get("register")
+    if not entry:
+        return False
+    try:
+        stat = os.stat(register_path)
+    except OSError:
+        return False
+    if (entry.get("path") == os.path.abspath(register_path)
+            and stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns")):
+        return True
+    # Touched, copied or moved: only the content decides
+    return file_hash(register_path) == entry["hash"]
+
+
+def read_manifest(out_dir: str) -> Optional[dict]:
+    """Manifest of the version LATEST points to, or None if nothing was built yet."""
+    version = latest_version(out_dir)
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(out_dir, version, MANIFEST_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class BuildArtifacts:
+    """Read-only view of one published build version. Files load on first access."""
+
+    def __init__(self, directory: str, manifest: dict):
+        self.directory = directory
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self._cache = {}
+
+    def load(self, stage: str):
+        if stage not in self._cache:
+            with open(os.path.join(self.directory, self.manifest["stages"][stage]["file"]), "r", encoding="utf-8") as f:
+                self._cache[stage] = json.load(f)
+        return self._cache[stage]
+
+    def stations(self) -> List[dict]:
+        """Stations as the dashboard expects them, enriched with Bezirk and traffic."""
+        regions = self.load("regions")
+        traffic = self.load("traffic")
+        stations = []
+        for s in self.load("stations"):
+            region = regions.get(s["station_id"], {})
+            stations.append(dict(
+                s,
+                bezirk=region.get("bezirk", "Unknown"),
+                cars_per_day=traffic.get(s["station_id"], {}).get("cars_per_day"),
+            ))
+        return stations
+
+
+def load_latest(out_dir: str, register_path: Optional[str] = None) -> Optional[BuildArtifacts]:
+    """
+    The version LATEST points to, or None if `python -m src.main build` never
+    ran or, when `register_path` is given, the build came from another register.
+    """
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        return None
+    if register_path is not None and not matches_register(manifest, register_path):
+        return None
+    directory = os.path.join(out_dir, manifest["version"])
+    if not all(os.path.exists(os.path.join(directory, s["file"])) for s in manifest["stages"].values()):
+        return None
+    return BuildArtifacts(directory, manifest)
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from src.shared.infrastructure.precompute import stages
+from src.shared.infrastructure.precompute.artifacts import LATEST_FILE, MANIFEST_FILE, file_hash, read_manifest
+from src.shared.infrastructure.repositories import berlin_datasets
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[[Dict[str, str], str], None]
+    output: str
+    datasets: Tuple[str, ...] = ()
+    deps: Tuple[str, ...] = ()
+    version: int = 1  # bump when the stage logic changes to invalidate old outputs
+
+
+STAGES = [
+    Stage("stations", stages.build_stations, "stations.json", datasets=("register",)),
+    Stage("regions", stages.build_regions, "regions.json", datasets=("plz_geodata", "bezirk_geodata"), deps=("stations",)),
+    Stage("traffic", stages.build_traffic, "traffic.json", datasets=("traffic",), deps=("stations", "regions")),
+    Stage("population", stages.build_population, "population.json",
+          datasets=("population", "plz_geodata", "bezirk_geodata"), deps=("stations", "regions"), version=2),
+    Stage("search_index", stages.build_search_index, "search_index.json", deps=("stations",)),
+    Stage("spatial_index", stages.build_spatial_index, "spatial_index.json", deps=("stations",)),
+]
+
+
+def default_datasets(register_path: str) -> Dict[str, str]:
+    return {
+        "register": register_path,
+        "plz_geodata": berlin_datasets.PLZ_GEODATA,
+        "bezirk_geodata": berlin_datasets.BEZIRK_GEODATA,
+        "traffic": berlin_datasets.TRAFFIC_VOLUMES,
+        "population": berlin_datasets.PLZ_POPULATION,
+    }
+
+
+def _dataset_entry(path: str, content_hash: str) -> dict:
+    stat = os.stat(path)
+    # size/mtime let readers validate cheaply; the hash is the source of truth
+    return {"path": os.path.abspath(path), "hash": content_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _input_hash(stage: Stage, dataset_hashes: Dict[str, str], output_hashes: Dict[str, str]) -> str:
+    digest = hashlib.sha256(f"{stage.name}:{stage.version}".encode())
+    for key in stage.datasets:
+        digest.update(f"{key}={dataset_hashes[key]}".encode())
+    for dep in stage.deps:
+        digest.update(f"{dep}={output_hashes[dep]}".encode())
+    return digest.hexdigest()
+
+
+def build(datasets: Dict[str, str], out_dir: str, workers: Optional[int] = None,
+          force: bool = False, keep: int = 5, log: Callable[[str], None] = print) -> dict:
+    """
+    Runs the precompute DAG and publishes a new artifact version.
+    A stage whose input hash (its dataset files + upstream outputs) matches
+    the previous build is copied over instead of recomputed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = None if force else read_manifest(out_dir)
+    previous_dir = os.path.join(out_dir, previous["version"]) if previous else None
+    previous_stages = previous["stages"] if previous else {}
+
+    dataset_hashes = {key: file_hash(path) for key, path in datasets.items()}
+    staging_dir = os.path.join(out_dir, f".staging-{os.getpid()}")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    by_name = {s.name: s for s in STAGES}
+    output_hashes: Dict[str, str] = {}
+    results: Dict[str, dict] = {}
+    running = {}
+
+    def stage_inputs(stage: Stage) -> Dict[str, str]:
+        inputs = {key: datasets[key] for key in stage.datasets}
+        inputs.update({dep: os.path.join(staging_dir, by_name[dep].output) for dep in stage.deps})
+        return inputs
+
+    def finish(stage: Stage, input_hash: str, reused: bool, started: datetime):
+        output_hashes[stage.name] = file_hash(os.path.join(staging_dir, stage.output))
+        results[stage.name] = {
+            "file": stage.output,
+            "input_hash": input_hash,
+            "output_hash": output_hashes[stage.name],
+            "reused": reused,
+            "seconds": round((datetime.now() - started).total_seconds(), 3),
+        }
+        log(f"  {'↺' if reused else '✔'} {stage.name:<14} {'unchanged' if reused else 'built'} "
+            f"({results[stage.name]['seconds']}s)")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = list(STAGES)
+            while pending or running:
+                for stage in [s for s in pending if all(d in output_hashes for d in s.deps)]:
+                    pending.remove(stage)
+                    input_hash = _input_hash(stage, dataset_hashes, output_hashes)
+                    started = datetime.now()
+                    prev = previous_stages.get(stage.name)
+                    prev_file = os.path.join(previous_dir, prev["file"]) if prev else None
+                    if prev and prev["input_hash"] == input_hash and os.path.exists(prev_file):
+                        shutil.copy2(prev_file, os.path.join(staging_dir, stage.output))
+                        finish(stage, input_hash, True, started)
+                    else:
+                        future = pool.submit(stage.run, stage_inputs(stage), os.path.join(staging_dir, stage.output))
+                        running[future] = (stage, input_hash, started)
+                if not running:
+                    continue  # reused stages may have unblocked more work
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, input_hash, started = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        raise RuntimeError(f"Stage '{stage.name}' failed: {e}") from e
+                    finish(stage, input_hash, False, started)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    version = hashlib.sha256(
+        "".join(f"{name}={results[name]['output_hash']}" for name in sorted(results)).encode()
+    ).hexdigest()[:12]
+    manifest = {
+        "version": version,
+        "created_at": datetime.now().isoformat(),
+        "datasets": {key: _dataset_entry(path, dataset_hashes[key]) for key, path in datasets.items()},
+        "stages": results,
+    }
+    with open(os.path.join(staging_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    version_dir = os.path.join(out_dir, version)
+    if os.path.exists(version_dir):
+        # Same outputs as an existing version: keep its files, but record the
+        # datasets of this build so readers validate against the current register
+        os.replace(os.path.join(staging_dir, MANIFEST_FILE), os.path.join(version_dir, MANIFEST_FILE))
+        shutil.rmtree(staging_dir)
+    else:
+        os.replace(staging_dir, version_dir)
+
+    latest_tmp = os.path.join(out_dir, LATEST_FILE + ".tmp")
+    with open(latest_tmp, "w") as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(out_dir, LATEST_FILE))
+
+    _prune(out_dir, keep, current=version)
+    return manifest
+
+
+def _prune(out_dir: str, keep: int, current: str):
+    versions = []
+    for name in os.listdir(out_dir):
+        manifest_path = os.path.join(out_dir, name, MANIFEST_FILE)
+        if name != current and os.path.exists(manifest_path):
+            versions.append((os.path.getmtime(manifest_path), name))
+    for _, name in sorted(versions, reverse=True)[max(keep - 1, 0):]:
+        shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
@@ -0,0 +1,127 @@
+import json
+import re
+from typing import Dict, List
+
+from src.shared.infrastructure.repositories import berlin_datasets
+
+# Each stage reads its inputs (dataset files and upstream stage outputs, by
+# name) and writes exactly one JSON file. Stages run in worker processes,
+# so they must stay module-level functions.
+
+GRID_SIZE = 0.01  # degrees, roughly 1.1 km north-south in Berlin
+
+
+def _read(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(path: str, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def build_stations(inputs: Dict[str, str], output: str):
+    """Register parsing and BER-[PLZ]-[Serial] ID normalization."""
+    from src.shared.infrastructure.repositories.station_register import load_berlin_stations
+    _write(output, load_berlin_stations(inputs["register"]))
+
+
+class _RegionLocator:
+    def __init__(self, regions):
+        self.regions = [(name, berlin_datasets.bounding_box(polys), polys) for name, polys in regions.items()]
+
+    def locate(self, lon: float, lat: float):
+        for name, (min_lon, min_lat, max_lon, max_lat), polys in self.regions:
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat and berlin_datasets.polygons_contain(polys, lon, lat):
+                return name
+        return None
+
+
+def build_regions(inputs: Dict[str, str], output: str):
+    """Assigns each station to the PLZ and Bezirk polygon it lies in."""
+    plz = _RegionLocator(berlin_datasets.plz_polygons(inputs["plz_geodata"]))
+    bezirk = _RegionLocator(berlin_datasets.bezirk_polygons(inputs["bezirk_geodata"]))
+    regions = {}
+    for s in _read(inputs["stations"]):
+        regions[s["station_id"]] = {
+            "plz_area": plz.locate(s["lon"], s["lat"]) or s["zip"],
+            "bezirk": bezirk.locate(s["lon"], s["lat"]) or "Unknown",
+        }
+    _write(output, regions)
+
+
+def _street_key(street: str) -> str:
+    # "Hardenbergstraße 12" / "Hardenbergstrasse" -> "hardenbergstrasse"
+    name = re.sub(r"\s+\d.*$", "", street.strip().lower())
+    return name.replace("ß", "ss").replace("str.", "strasse")
+
+
+def build_traffic(inputs: Dict[str, str], output: str):
+    """Joins each station to the busiest road segment of its street in its Bezirk."""
+    busiest = {}
+    for seg in berlin_datasets.traffic_segments(inputs["traffic"]):
+        key = (_street_key(seg["street"]), seg["bezirk"])
+        busiest[key] = max(busiest.get(key, 0.0), seg["cars_per_day"])
+
+    regions = _read(inputs["regions"])
+    traffic = {}
+    for s in _read(inputs["stations"]):
+        bezirk = regions.get(s["station_id"], {}).get("bezirk", "Unknown")
+        cars = busiest.get((_street_key(s["street"]), bezirk))
+        if cars is not None:
+            traffic[s["station_id"]] = {"cars_per_day": cars}
+    _write(output, traffic)
+
+
+def build_population(inputs: Dict[str, str], output: str):
+    """Stations, inhabitants and stations per 10k inhabitants per PLZ and Bezirk.
+    Every Berlin PLZ counts towards its Bezirk (by polygon centroid), whether
+    or not it has stations."""
+    population = berlin_datasets.plz_population(inputs["population"])
+    bezirk = _RegionLocator(berlin_datasets.bezirk_polygons(inputs["bezirk_geodata"]))
+    regions = _read(inputs["regions"])
+
+    per_plz, per_bezirk = {}, {}
+    for plz, polys in berlin_datasets.plz_polygons(inputs["plz_geodata"]).items():
+        name = bezirk.locate(*berlin_datasets.centroid(polys)) or "Unknown"
+        einwohner = population.get(plz, {}).get("einwohner", 0)
+        per_plz[plz] = {"stations": 0, "bezirk": name, "einwohner": einwohner}
+        row = per_bezirk.setdefault(name, {"stations": 0, "einwohner": 0})
+        row["einwohner"] += einwohner
+
+    for s in _read(inputs["stations"]):
+        region = regions.get(s["station_id"], {})
+        plz = region.get("plz_area", s["zip"])
+        if plz not in per_plz:
+            # Station outside every PLZ polygon: keep it, without inhabitants
+            per_plz[plz] = {"stations": 0, "bezirk": region.get("bezirk", "Unknown"), "einwohner": 0}
+        per_plz[plz]["stations"] += 1
+        per_bezirk.setdefault(region.get("bezirk", "Unknown"), {"stations": 0, "einwohner": 0})["stations"] += 1
+
+    for row in list(per_plz.values()) + list(per_bezirk.values()):
+        row["stations_per_10k"] = round(row["stations"] / row["einwohner"] * 10000, 2) if row["einwohner"] else None
+
+    _write(output, {"plz": per_plz, "bezirk": per_bezirk})
+
+
+def build_search_index(inputs: Dict[str, str], output: str):
+    """ZIP and operator -> station IDs, for instant lookups in the sidebar."""
+    by_zip: Dict[str, List[str]] = {}
+    by_operator: Dict[str, List[str]] = {}
+    for s in _read(inputs["stations"]):
+        by_zip.setdefault(s["zip"], []).append(s["station_id"])
+        by_operator.setdefault(s["operator"], []).append(s["station_id"])
+    _write(output, {"zip": by_zip, "operator": by_operator})
+
+
+def grid_cell(lat: float, lon: float) -> str:
+    return f"{int(lat // GRID_SIZE)}:{int(lon // GRID_SIZE)}"
+
+
+def build_spatial_index(inputs: Dict[str, str], output: str):
+    """Uniform lat/lon grid -> station IDs, for nearby-station queries."""
+    cells: Dict[str, List[str]] = {}
+    for s in _read(inputs["stations"]):
+        cells.setdefault(grid_cell(s["lat"], s["lon"]), []).append(s["station_id"])
+    _write(output, {"grid_size": GRID_SIZE, "cells": cells})
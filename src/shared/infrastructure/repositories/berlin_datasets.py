@@ -0,0 +1,127 @@
+import csv
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Nothing here is read at import time: each dataset is parsed on first use
+# and then cached for the lifetime of the process.
+DATASET_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datasets", "berlin_postleitzahlen"
+)
+PLZ_GEODATA = os.path.join(DATASET_DIR, "geodata_berlin_plz.csv")
+BEZIRK_GEODATA = os.path.join(DATASET_DIR, "geodata_berlin_dis.csv")
+TRAFFIC_VOLUMES = os.path.join(DATASET_DIR, "Verkehrsaufkommen.csv")
+PLZ_POPULATION = os.path.join(DATASET_DIR, "plz_einwohner.csv")
+
+# A polygon is a list of rings (outer ring first), a ring a list of (lon, lat)
+Ring = List[Tuple[float, float]]
+Polygon = List[Ring]
+
+_RING = re.compile(r"\(([^()]+)\)")
+_POLYGON = re.compile(r"\(\s*(\([^()]+\)(?:\s*,\s*\([^()]+\))*)\s*\)")
+
+
+def parse_wkt_polygons(wkt: str) -> List[Polygon]:
+    """Parses a WKT POLYGON or MULTIPOLYGON into a list of polygons."""
+    polygons = []
+    for body in _POLYGON.findall(wkt):
+        rings = []
+        for ring_text in _RING.findall(body):
+            ring = []
+            for pair in ring_text.split(","):
+                lon, lat = pair.split()
+                ring.append((float(lon), float(lat)))
+            rings.append(ring)
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+def _german_float(value: str) -> float:
+    try:
+        return float(value.replace(".", "").replace(",", ".")) if "," in value else float(value)
+    except (ValueError, AttributeError):
+        return 0.0
+
+
+def _read_geodata(path: str, key_column: str) -> Dict[str, List[Polygon]]:
+    csv.field_size_limit(2 ** 31 - 1)  # polygon rows are far above the default limit
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return {row[key_column]: parse_wkt_polygons(row["geometry"]) for row in csv.DictReader(f, delimiter=";")}
+
+
+@lru_cache(maxsize=None)
+def plz_polygons(path: str = PLZ_GEODATA) -> Dict[str, List[Polygon]]:
+    return _read_geodata(path, "PLZ")
+
+
+@lru_cache(maxsize=None)
+def bezirk_polygons(path: str = BEZIRK_GEODATA) -> Dict[str, List[Polygon]]:
+    return _read_geodata(path, "Bezirk")
+
+
+@lru_cache(maxsize=None)
+def traffic_segments(path: str = TRAFFIC_VOLUMES) -> List[dict]:
+    """Road segments with their average weekday traffic (DTVw 2019)."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [{
+            "street": row["Straßenname"],
+            "bezirk": row["Bezirk"],
+            "ortsteil": row["Ortsteil"],
+            "cars_per_day": _german_float(row["DTVw-2019-Kfz"]),
+            "trucks_per_day": _german_float(row["DTVw-2019-Lkw"]),
+        } for row in csv.DictReader(f, delimiter=";")]
+
+
+@lru_cache(maxsize=None)
+def plz_population(path: str = PLZ_POPULATION) -> Dict[str, dict]:
+    """Inhabitants and area (km²) per German PLZ."""
+    with open(path, encoding="utf-8", newline="") as f:
+        return {row["plz"]: {
+            "einwohner": int(_german_float(row["einwohner"])),
+            "qkm": _german_float(row["qkm"]),
+        } for row in csv.DictReader(f)}
+
+
+def polygons_contain(polygons: List[Polygon], lon: float, lat: float) -> bool:
+    """Even-odd ray casting; holes (inner rings) are handled by the parity."""
+    for polygon in polygons:
+        inside = False
+        for ring in polygon:
+            j = len(ring) - 1
+            for i in range(len(ring)):
+                xi, yi = ring[i]
+                xj, yj = ring[j]
+                if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+                    inside = not inside
+                j = i
+        if inside:
+            return True
+    return False
+
+
+def bounding_box(polygons: List[Polygon]) -> Tuple[float, float, float, float]:
+    lons = [lon for polygon in polygons for lon, _ in polygon[0]]
+    lats = [lat for polygon in polygons for _, lat in polygon[0]]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def centroid(polygons: List[Polygon]) -> Tuple[float, float]:
+    """Area centroid (lon, lat) of the largest polygon's outer ring."""
+    best = None
+    for polygon in polygons:
+        ring = polygon[0]
+        area = cx = cy = 0.0
+        for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+            cross = x0 * y1 - x1 * y0
+            area += cross
+            cx += (x0 + x1) * cross
+            cy += (y0 + y1) * cross
+        if area and (best is None or abs(area) > abs(best[0])):
+            best = (area, cx / (3 * area), cy / (3 * area))
+    if best is None:
+        lons = [lon for polygon in polygons for lon, _ in polygon[0]]
+        lats = [lat for polygon in polygons for _, lat in polygon[0]]
+        return sum(lons) / len(lons), sum(lats) / len(lats)
+    return best[1], best[2]
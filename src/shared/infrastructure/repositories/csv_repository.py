@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import List
 from src.shared.domain.entities.charging_station import ChargingStation
 from src.shared.domain.repositories.charging_station_repository import ChargingStationRepository
@@ -6,9 +5,21 @@ from src.shared.domain.repositories.charging_station_repository import ChargingS
 class CsvChargingStationRepository(ChargingStationRepository):
     def __init__(self, file_path: str):
         self.file_path = file_path
-        self.df = self._load_data()
+        self._df = None
 
-    def _load_data(self) -> pd.DataFrame:
+    @property
+    def df(self):
+        # The register is only read (and pandas only imported) on first query
+        return self.load()
+
+    def load(self):
+        """Reads the register now if it wasn't yet, e.g. to warm up before serving."""
+        if self._df is None:
+            self._df = self._load_data()
+        return self._df
+
+    def _load_data(self):
+        import pandas as pd
         try:
             # 1. Try reading with UTF-8 (standard)
             df = pd.read_csv(
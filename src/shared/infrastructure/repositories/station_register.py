@@ -0,0 +1,43 @@
+from typing import List
+
+# Geographic Authentication: Berlin Bounding Box
+BERLIN_LAT = (52.3, 52.7)
+BERLIN_LON = (13.0, 13.8)
+
+
+def load_berlin_stations(path: str) -> List[dict]:
+    """
+    Reads the BNetzA Ladesäulenregister and returns the Berlin stations as
+    plain dicts with normalized IDs (BER-[PostalCode]-[SerialNumber]).
+    """
+    import pandas as pd
+
+    # Load using German CSV standards
+    df = pd.read_csv(path, sep=';', encoding='utf-8', low_memory=False)
+    df.columns = df.columns.str.strip()
+
+    data = []
+    zip_counters = {}
+
+    for i, row in df.iterrows():
+        lat_str = str(row.get('Breitengrad', '0')).replace(',', '.').strip(' .')
+        lon_str = str(row.get('Längengrad', row.get('Laengengrad', '0'))).replace(',', '.').strip(' .')
+
+        try:
+            lat, lon = float(lat_str), float(lon_str)
+            if BERLIN_LAT[0] <= lat <= BERLIN_LAT[1] and BERLIN_LON[0] <= lon <= BERLIN_LON[1]:
+                zip_val = str(row.get('Postleitzahl', '')).split('.')[0].zfill(5) if pd.notna(row.get('Postleitzahl')) else "00000"
+
+                zip_counters[zip_val] = zip_counters.get(zip_val, 0) + 1
+                serial_no = zip_counters[zip_val]
+                station_id = f"BER-{zip_val}-{serial_no}"
+
+                data.append({
+                    "lat": lat, "lon": lon,
+                    "operator": str(row.get('Betreiber', 'Unknown')).strip(),
+                    "station_id": station_id,
+                    "zip": zip_val,
+                    "street": str(row.get('Straße', row.get('Strasse', 'Unknown'))).strip()
+                })
+        except: continue
+    return data
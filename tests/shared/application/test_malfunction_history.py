@@ -0,0 +1,130 @@
+import threading
+import pytest
+from datetime import datetime, timedelta
+from src.shared.application.services.malfunction_service import MalfunctionService
+from src.shared.application.services.malfunction_history import MalfunctionHistory
+
+OPERATORS = {"BER-10115-1": "Vattenfall", "BER-10115-2": "Allego", "BER-12043-1": "Vattenfall"}
+
+
+def dims(station_id):
+    return {"operator": OPERATORS.get(station_id), "plz": station_id.split("-")[1], "bezirk": "Mitte"}
+
+
+@pytest.fixture
+def history(tmp_path):
+    return MalfunctionHistory(data_dir=str(tmp_path), station_dimensions=dims)
+
+
+def test_resolve_keeps_report_in_history(tmp_path, history):
+    service = MalfunctionService(data_path=str(tmp_path / "malfunctions.json"), history=history)
+    service.report_malfunction("BER-10115-1", "No Power")
+    service.resolve_malfunction("BER-10115-1")
+
+    assert service.get_all_reports() == []
+    resolved = history.get_history()
+    assert len(resolved) == 1
+    assert resolved[0]["station_id"] == "BER-10115-1"
+    assert resolved[0]["status"] == "Resolved"
+
+
+def test_rollups_per_operator_and_plz(history):
+    t0 = datetime(2025, 12, 25, 9, 15)
+    history.record_reported([
+        {"station_id": "BER-10115-1", "timestamp": t0.isoformat(), "count": 3, "opened": True},
+        {"station_id": "BER-10115-2", "timestamp": t0.isoformat(), "count": 1, "opened": True},
+        {"station_id": "BER-12043-1", "timestamp": (t0 + timedelta(hours=2)).isoformat(), "count": 1, "opened": True},
+    ])
+
+    by_operator = history.summary("operator")
+    assert by_operator["Vattenfall"]["reported"] == 4
+    assert by_operator["Vattenfall"]["opened"] == 2
+    assert by_operator["Allego"]["reported"] == 1
+
+    hourly = history.series("plz", "10115", granularity="hour")
+    assert [b["bucket"] for b in hourly] == ["2025-12-25T09"]
+    assert history.summary("all")["Berlin"]["opened"] == 3
+
+
+def test_mttr_and_open_age(history):
+    opened = datetime(2025, 12, 25, 8, 0)
+    history.record_reported([
+        {"station_id": "BER-10115-1", "timestamp": opened.isoformat(), "opened": True},
+        {"station_id": "BER-12043-1", "timestamp": opened.isoformat(), "opened": True},
+    ])
+    history.record_resolved(
+        [{"station_id": "BER-10115-1", "description": "No Power", "timestamp": opened.isoformat()}],
+        resolved_at=opened + timedelta(hours=4),
+    )
+
+    assert history.summary("operator")["Vattenfall"]["mttr_hours"] == 4.0
+    open_now = history.open_summary("operator", now=opened + timedelta(hours=10))
+    assert open_now["Vattenfall"] == {"open": 1, "mean_age_hours": 10.0}
+
+
+def test_rollups_survive_restart(tmp_path, history):
+    history.record_reported([{"station_id": "BER-10115-2", "timestamp": "2025-12-25T10:00:00", "opened": True}])
+    reloaded = MalfunctionHistory(data_dir=str(tmp_path), station_dimensions=dims)
+    assert reloaded.summary("operator")["Allego"]["reported"] == 1
+
+
+def test_range_queries_read_rollups_only(history, monkeypatch):
+    start = datetime(2025, 1, 1)
+    history.record_reported([
+        {"station_id": "BER-10115-1", "timestamp": (start + timedelta(hours=h)).isoformat(), "opened": True}
+        for h in range(24 * 365)
+    ])
+    history.record_resolved(
+        [{"station_id": "BER-10115-1", "description": "No Power", "timestamp": start.isoformat()}],
+        resolved_at=start + timedelta(days=2),
+    )
+
+    # Dashboards must never fall back to scanning the raw history
+    real_open = open
+
+    def guarded_open(path, *args, **kwargs):
+        assert str(path) != history.history_path, "query rescanned the raw history"
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", guarded_open)
+    monkeypatch.setattr(history, "get_history", lambda: pytest.fail("query called get_history"))
+
+    buckets = history.series("operator", "Vattenfall", granularity="hour",
+                             start=datetime(2025, 3, 1), end=datetime(2025, 9, 1))
+    yearly = history.summary("plz", granularity="day", start=start, end=start + timedelta(days=365))
+
+    assert len(buckets) == (datetime(2025, 9, 1) - datetime(2025, 3, 1)).days * 24 + 1
+    assert buckets[0]["bucket"] == "2025-03-01T00"
+    assert yearly["10115"]["reported"] == 24 * 365
+    assert yearly["10115"]["resolved"] == 1
+
+
+def test_concurrent_resolves_count_each_report_once(tmp_path, history):
+    service = MalfunctionService(data_path=str(tmp_path / "malfunctions.json"), history=history)
+    stations = [f"BER-10115-{i}" for i in range(20)]
+    now = datetime.now().isoformat()
+    service.merge_reports([
+        {"station_id": sid, "description": "No Power", "timestamp": now, "status": "Open"} for sid in stations
+    ])
+
+    def resolve_all():
+        for sid in stations:
+            service.resolve_malfunction(sid)
+
+    def keep_merging():
+        for i in range(20):
+            service.merge_reports([{"station_id": f"BER-12043-{i}", "description": "No Power",
+                                    "timestamp": datetime.now().isoformat(), "status": "Open"}])
+
+    threads = [threading.Thread(target=resolve_all) for _ in range(4)] + [threading.Thread(target=keep_merging)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    plz = history.summary("plz")
+    assert plz["10115"]["opened"] == 20
+    assert plz["10115"]["resolved"] == 20
+    assert "10115" not in history.open_summary("plz")
+    assert history.open_summary("plz")["12043"]["open"] == 20
+    assert len(history.get_history()) == 20
@@ -0,0 +1,176 @@
+import threading
+import time
+import weakref
+import pytest
+from datetime import datetime, timedelta
+from src.shared.application.services.malfunction_service import MalfunctionService
+from src.shared.application.services.malfunction_intake import MalfunctionIntake, _flush_at_exit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2025, 12, 25, 12, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def service(tmp_path):
+    return MalfunctionService(data_path=str(tmp_path / "malfunctions.json"))
+
+
+def test_duplicates_are_coalesced_into_one_report(service, clock):
+    intake = MalfunctionIntake(service, session_capacity=100, clock=clock)
+    for i in range(10):
+        assert intake.submit("BER-10409-1", "No Power", session_id=f"s{i}") is True
+    intake.flush()
+
+    reports = service.get_all_reports()
+    assert len(reports) == 1
+    assert reports[0]["count"] == 10
+
+
+def test_coalescing_continues_across_flushes(service, clock):
+    intake = MalfunctionIntake(service, clock=clock)
+    intake.submit("BER-10409-1", "No Power", session_id="a")
+    intake.flush()
+    clock.advance(30)
+    intake.submit("BER-10409-1", "No Power", session_id="b")
+    intake.flush()
+
+    reports = service.get_all_reports()
+    assert len(reports) == 1
+    assert reports[0]["count"] == 2
+
+
+def test_reports_outside_window_are_kept_separate(service, clock):
+    intake = MalfunctionIntake(service, window_seconds=60, clock=clock)
+    intake.submit("BER-10409-1", "No Power")
+    intake.flush()
+    clock.advance(3600)
+    intake.submit("BER-10409-1", "No Power")
+    intake.flush()
+
+    assert len(service.get_all_reports()) == 2
+
+
+def test_session_is_rate_limited(service, clock):
+    intake = MalfunctionIntake(service, session_capacity=2, session_rate=0, clock=clock)
+    assert intake.submit("BER-1", "No Power", session_id="spammer") is True
+    assert intake.submit("BER-2", "No Power", session_id="spammer") is True
+    assert intake.submit("BER-3", "No Power", session_id="spammer") is False
+    assert intake.submit("BER-3", "No Power", session_id="someone-else") is True
+
+
+def test_station_is_rate_limited_and_refills(service, clock):
+    intake = MalfunctionIntake(service, station_capacity=1, station_rate=1 / 60, clock=clock)
+    assert intake.submit("BER-1", "No Power", session_id="a") is True
+    assert intake.submit("BER-1", "Screen Broken", session_id="b") is False
+    clock.advance(60)
+    assert intake.submit("BER-1", "Screen Broken", session_id="b") is True
+
+
+def test_flushes_in_micro_batches(service, clock):
+    intake = MalfunctionIntake(service, batch_size=3, flush_interval=60, session_capacity=100, clock=clock)
+    intake.submit("BER-1", "No Power")
+    intake.submit("BER-2", "No Power")
+    assert service.get_all_reports() == []
+    assert intake.is_station_broken("BER-1") is True
+
+    intake.submit("BER-3", "No Power")
+    assert len(service.get_all_reports()) == 3
+    assert intake.pending_count() == 0
+
+
+def test_flush_if_due_respects_interval(service, clock):
+    intake = MalfunctionIntake(service, flush_interval=2, clock=clock)
+    intake.submit("BER-1", "No Power")
+    intake.flush_if_due()
+    assert intake.pending_count() == 1
+    clock.advance(2)
+    intake.flush_if_due()
+    assert intake.pending_count() == 0
+
+
+def test_background_timer_flushes_without_further_traffic(service):
+    intake = MalfunctionIntake(service, flush_interval=0.05)
+    assert intake.submit("BER-1", "No Power") is True
+
+    deadline = time.monotonic() + 5
+    while intake.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert intake.pending_count() == 0
+    assert [r["station_id"] for r in service.get_all_reports()] == ["BER-1"]
+
+
+def test_background_timer_retries_after_failed_flush(service, monkeypatch):
+    merge_reports = service.merge_reports
+    calls = []
+
+    def flaky_merge(batch, window_seconds=0):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        merge_reports(batch, window_seconds=window_seconds)
+
+    monkeypatch.setattr(service, "merge_reports", flaky_merge)
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+    intake = MalfunctionIntake(service, flush_interval=0.05)
+    assert intake.submit("BER-1", "No Power") is True
+
+    deadline = time.monotonic() + 5
+    while intake.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(calls) == 2
+    assert [r["station_id"] for r in service.get_all_reports()] == ["BER-1"]
+
+
+def test_pending_reports_are_flushed_at_exit(service, clock):
+    intake = MalfunctionIntake(service, flush_interval=60, clock=clock)
+    intake.submit("BER-1", "No Power")
+
+    _flush_at_exit(weakref.ref(intake))
+
+    assert len(service.get_all_reports()) == 1
+
+
+def test_concurrent_submits_and_resolves_lose_no_reports(service):
+    intake = MalfunctionIntake(service, batch_size=5, flush_interval=0.01, station_capacity=1000,
+                               station_rate=0, session_capacity=1000, session_rate=0)
+    reported = [f"BER-10115-{i}" for i in range(200)]
+    resolved = [f"BER-10117-{i}" for i in range(4)]
+    service.merge_reports([
+        {"station_id": sid, "description": "No Power", "timestamp": datetime.now().isoformat(), "status": "Open"}
+        for sid in resolved
+    ])
+
+    def submit(offset):
+        for sid in reported[offset::4]:
+            assert intake.submit(sid, "No Power", session_id=f"s{offset}") is True
+
+    def resolve():
+        for _ in range(50):
+            for sid in resolved:
+                intake.resolve(sid)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(4)] + \
+              [threading.Thread(target=resolve) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    intake.flush()
+
+    stored = {r["station_id"] for r in service.get_all_reports()}
+    assert stored == set(reported)
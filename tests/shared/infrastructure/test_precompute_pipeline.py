@@ -0,0 +1,127 @@
+import os
+import json
+import pytest
+from src.main import main
+from src.shared.infrastructure.precompute.artifacts import load_latest
+from src.shared.infrastructure.precompute.pipeline import STAGES, build, default_datasets, read_manifest
+from src.shared.infrastructure.repositories.berlin_datasets import (
+    bezirk_polygons, plz_polygons, plz_population, polygons_contain,
+)
+
+HEADER = "Betreiber;Straße;Hausnummer;Postleitzahl;Ort;Breitengrad;Längengrad\n"
+ROWS = [
+    "Vattenfall;Unter den Linden;1;10117;Berlin;52,5170;13,3889\n",
+    "Shell;Hardenbergstraße;12;10623;Berlin;52,5120;13,3280\n",
+]
+
+
+@pytest.fixture
+def register(tmp_path):
+    path = tmp_path / "register.csv"
+    path.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    return path
+
+
+def quiet(_):
+    pass
+
+
+def test_build_publishes_manifest_and_artifacts(tmp_path, register):
+    out = tmp_path / "artifacts"
+    manifest = build(default_datasets(str(register)), str(out), workers=2, log=quiet)
+
+    assert set(manifest["stages"]) == {s.name for s in STAGES}
+    assert (out / "LATEST").read_text() == manifest["version"]
+    assert read_manifest(str(out))["version"] == manifest["version"]
+
+    stations = {s["station_id"]: s for s in load_latest(str(out)).stations()}
+    assert stations["BER-10117-1"]["bezirk"] == "Mitte"
+    assert stations["BER-10623-1"]["bezirk"] == "Charlottenburg-Wilmersdorf"
+
+
+def test_unchanged_inputs_skip_every_stage(tmp_path, register):
+    out = str(tmp_path / "artifacts")
+    first = build(default_datasets(str(register)), out, log=quiet)
+    second = build(default_datasets(str(register)), out, log=quiet)
+
+    assert second["version"] == first["version"]
+    assert all(s["reused"] for s in second["stages"].values())
+
+
+def test_changed_register_rebuilds_only_downstream_stages(tmp_path, register):
+    out = str(tmp_path / "artifacts")
+    first = build(default_datasets(str(register)), out, log=quiet)
+    register.write_text(HEADER + "".join(ROWS) + "EnBW;Ritterstraße;26;10969;Berlin;52,5020;13,4090\n", encoding="utf-8")
+    second = build(default_datasets(str(register)), out, log=quiet)
+
+    assert second["version"] != first["version"]
+    assert not second["stages"]["stations"]["reused"]
+    assert not second["stages"]["regions"]["reused"]
+    search_index = json.loads((tmp_path / "artifacts" / second["version"] / "search_index.json").read_text())
+    assert search_index["zip"]["10969"] == ["BER-10969-1"]
+
+
+def test_force_rebuilds_everything(tmp_path, register):
+    out = str(tmp_path / "artifacts")
+    build(default_datasets(str(register)), out, log=quiet)
+    forced = build(default_datasets(str(register)), out, force=True, log=quiet)
+    assert not any(s["reused"] for s in forced["stages"].values())
+
+
+def test_cli_build(tmp_path, register, capsys):
+    assert main(["build", "--register", str(register), "--out", str(tmp_path / "artifacts"), "--workers", "1"]) == 0
+    assert "6 of 6 stages rebuilt" in capsys.readouterr().out
+
+
+def test_polygons_contain_respects_holes():
+    square_with_hole = [[
+        [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+        [(4, 4), (6, 4), (6, 6), (4, 6), (4, 4)],
+    ]]
+    assert polygons_contain(square_with_hole, 2, 2) is True
+    assert polygons_contain(square_with_hole, 5, 5) is False
+    assert polygons_contain(square_with_hole, 11, 5) is False
+
+
+def test_bezirk_population_counts_plz_without_stations(tmp_path, register):
+    out = tmp_path / "artifacts"
+    manifest = build(default_datasets(str(register)), str(out), log=quiet)
+    population = json.loads((out / manifest["version"] / "population.json").read_text())
+
+    expected = sum(plz_population().get(plz, {}).get("einwohner", 0) for plz in plz_polygons())
+    assert sum(row["einwohner"] for row in population["bezirk"].values()) == expected
+    assert set(population["bezirk"]) == set(bezirk_polygons())
+    # 10115 has no station in the fixture but still belongs to Mitte
+    assert population["plz"]["10115"]["stations"] == 0
+    assert population["plz"]["10115"]["bezirk"] == "Mitte"
+    assert population["bezirk"]["Mitte"]["stations"] == 1
+
+
+def test_load_latest_rejects_build_from_another_register(tmp_path, register):
+    out = str(tmp_path / "artifacts")
+    build(default_datasets(str(register)), out, log=quiet)
+
+    other = tmp_path / "real_register.csv"
+    other.write_text(HEADER + ROWS[0], encoding="utf-8")
+    assert load_latest(out, register_path=str(other)) is None
+    assert load_latest(out, register_path=str(register)) is not None
+
+    # Same path, touched but unchanged: still valid. Changed content: rejected.
+    os.utime(register, ns=(1, 1))
+    assert load_latest(out, register_path=str(register)) is not None
+    register.write_text(HEADER + ROWS[1], encoding="utf-8")
+    assert load_latest(out, register_path=str(register)) is None
+
+
+def test_rebuild_with_identical_outputs_records_current_register(tmp_path, register):
+    out = str(tmp_path / "artifacts")
+    first = build(default_datasets(str(register)), out, log=quiet)
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(register.read_bytes())
+    second = build(default_datasets(str(copy)), out, log=quiet)
+
+    assert second["version"] == first["version"]
+    assert read_manifest(out)["datasets"]["register"]["path"] == str(copy)
+    assert load_latest(out, register_path=str(copy)) is not None
+    # Same content elsewhere (e.g. a moved checkout) is accepted too
+    assert load_latest(out, register_path=str(register)) is not None
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+SERVICE_MODULES = [
+    "src.shared.application.services.station_service",
+    "src.shared.application.services.malfunction_service",
+    "src.shared.application.services.malfunction_intake",
+    "src.shared.application.services.malfunction_history",
+    "src.shared.infrastructure.repositories.csv_repository",
+    "src.shared.infrastructure.repositories.station_register",
+    "src.shared.infrastructure.repositories.berlin_datasets",
+    "src.shared.infrastructure.precompute.artifacts",
+    "src.maintenance.application.services.malfunction_service",
+]
+HEAVY_MODULES = [
+    "pandas", "numpy", "pydeck", "streamlit",
+    # The dashboard reads build artifacts but must not load the build machinery
+    "concurrent.futures.process",
+    "src.shared.infrastructure.precompute.pipeline",
+    "src.shared.infrastructure.precompute.stages",
+]
+
+# Generous on purpose: these modules only pull in the stdlib, which imports
+# in a few tens of milliseconds. Pulling pandas back in costs several hundred.
+IMPORT_BUDGET_SECONDS = 0.15
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - started
+datasets = sys.modules["src.shared.infrastructure.repositories.berlin_datasets"]
+loaded = [f.__name__ for f in (datasets.plz_polygons, datasets.bezirk_polygons, datasets.traffic_segments, datasets.plz_population)
+          if f.cache_info().currsize]
+print(json.dumps({{"elapsed": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules], "datasets": loaded}}))
+"""
+
+
+def _probe():
+    code = PROBE.format(modules=SERVICE_MODULES, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_service_layers_import_without_heavy_dependencies():
+    assert _probe()["heavy"] == []
+
+
+def test_datasets_are_not_read_at_import():
+    assert _probe()["datasets"] == []
+
+
+def test_service_layers_import_within_budget():
+    # Best of three, so a busy CI machine doesn't fail the build on its own
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"service import took {elapsed * 1000:.0f} ms"
@@ -0,0 +1,64 @@
+import random
+import pytest
+from src.shared.application.services.malfunction_service import MalfunctionService
+from src.shared.application.services.station_service import StationService
+from src.shared.domain.entities.charging_station import ChargingStation
+from src.shared.infrastructure.repositories.csv_repository import CsvChargingStationRepository
+from tools.load_test import Session, build_parser, load_stations, percentile, run
+
+
+def test_percentile_picks_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_single_session_run_loses_nothing(tmp_path):
+    options = build_parser().parse_args([
+        "--sessions", "1", "--ops", "40", "--stations", "30",
+        "--mix", "search=1,filter=1,report=2,resolve=1",
+        "--data-path", str(tmp_path / "malfunctions.json"),
+    ])
+    summary = run(options)
+
+    assert summary["total_ops"] == 40
+    assert set(summary["operations"]) <= {"search", "filter", "report", "resolve"}
+    assert summary["lost_updates"] == 0
+    assert summary["stored_reports"] == summary["acked_reports"]
+
+
+def test_intake_backend_flushes_before_counting(tmp_path):
+    options = build_parser().parse_args([
+        "--sessions", "4", "--ops", "25", "--stations", "30", "--backend", "intake",
+        "--mix", "report=1", "--data-path", str(tmp_path / "malfunctions.json"),
+    ])
+    summary = run(options)
+
+    assert summary["acked_reports"] == 100
+    assert summary["lost_updates"] == 0
+
+
+def test_refuses_to_overwrite_existing_reports(tmp_path):
+    store = tmp_path / "malfunctions.json"
+    MalfunctionService(data_path=str(store)).report_malfunction("BER-10115-1", "No Power")
+    args = ["--sessions", "1", "--ops", "5", "--stations", "10", "--data-path", str(store)]
+
+    with pytest.raises(FileExistsError):
+        run(build_parser().parse_args(args))
+    assert len(MalfunctionService(data_path=str(store)).get_all_reports()) == 1
+
+    summary = run(build_parser().parse_args(args + ["--overwrite"]))
+    assert summary["total_ops"] == 5
+
+
+def test_search_goes_through_station_service(tmp_path):
+    stations, register = load_stations(None, 40, str(tmp_path))
+    service = StationService(CsvChargingStationRepository(register))
+    session = Session("s0", stations, service, [], [], None, None, {"search": 1}, random.Random(1))
+
+    results = session.search()
+
+    assert results
+    assert all(isinstance(r, ChargingStation) for r in results)
+    assert len({r.zip_code for r in results}) == 1
@@ -0,0 +1,332 @@
+"""
+Local load generator for ChargeHub Berlin.
+
+Simulates many concurrent driver/operator sessions hitting the station data
+path (StationService over CsvChargingStationRepository for ZIP search, the
+dashboard's View-All filtering) and the malfunction store, then prints throughput, p50/p95/p99 latency
+per operation and the number of lost updates (acknowledged reports that are
+missing from storage at the end of the run).
+
+Examples:
+    python tools/load_test.py --sessions 32 --duration 10
+    python tools/load_test.py --backend intake --processes 4 --mix search=40,filter=30,report=25,resolve=5
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.shared.application.services.malfunction_service import MalfunctionService
+from src.shared.application.services.malfunction_intake import MalfunctionIntake
+from src.shared.application.services.station_service import StationService
+from src.shared.infrastructure.repositories.csv_repository import CsvChargingStationRepository
+from src.shared.infrastructure.repositories.station_register import load_berlin_stations
+
+OPERATIONS = ("search", "filter", "report", "resolve")
+ISSUE_TYPES = ["Screen Broken", "No Power", "Cable Damaged"]
+DEFAULT_MIX = "search=50,filter=20,report=20,resolve=10"
+
+
+# ---------- Setup ----------
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}' (expected one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def write_synthetic_register(path: str, count: int, seed: int = 7):
+    """A register CSV in the BNetzA layout, so synthetic runs go through the
+    same parsing and repository code as the real export."""
+    rng = random.Random(seed)
+    zips = [f"{z:05d}" for z in range(10115, 10115 + 60)]
+    operators = ["Vattenfall", "Allego", "EnBW", "Shell Recharge", "Tesla", "E.ON"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Betreiber;Straße;Hausnummer;Postleitzahl;Ort;Breitengrad;Längengrad\n")
+        for i in range(count):
+            lat, lon = rng.uniform(52.4, 52.6), rng.uniform(13.2, 13.6)
+            f.write(f"{rng.choice(operators)};Teststraße;{i + 1};{rng.choice(zips)};Berlin;"
+                    f"{lat:.6f}".replace(".", ",") + ";" + f"{lon:.6f}".replace(".", ",") + "\n")
+
+
+def load_stations(csv_path, count: int, tmp_dir: str):
+    """Returns (stations, register path). Without a usable CSV, a synthetic register is written to tmp_dir."""
+    if csv_path:
+        stations = load_berlin_stations(csv_path)
+        if stations:
+            return stations, csv_path
+        print(f"⚠️ No Berlin stations in {csv_path}, falling back to synthetic data.")
+    register = os.path.join(tmp_dir, "synthetic_register.csv")
+    write_synthetic_register(register, count)
+    return load_berlin_stations(register), register
+
+
+def split_pools(stations: list):
+    """Reports and resolves touch disjoint stations, so any acknowledged
+    report that goes missing was overwritten by a concurrent writer."""
+    ids = [s["station_id"] for s in stations]
+    cut = max(1, len(ids) // 5)
+    return ids[cut:], ids[:cut]
+
+
+def make_store(backend: str, data_path: str):
+    service = MalfunctionService(data_path=data_path)
+    if backend == "intake":
+        # Limits are opened up: the harness measures storage, not throttling
+        return service, MalfunctionIntake(service, session_capacity=1e9, station_capacity=1e9)
+    return service, None
+
+
+# ---------- Simulated session ----------
+
+class Session:
+    def __init__(self, session_id, stations, station_service, report_pool, resolve_pool, service, intake, mix, rng):
+        self.session_id = session_id
+        self.stations = stations
+        self.station_service = station_service
+        self.report_pool = report_pool
+        self.resolve_pool = resolve_pool
+        self.service = service
+        self.intake = intake
+        self.ops = list(mix)
+        self.weights = [mix[o] for o in self.ops]
+        self.rng = rng
+        self.zips = sorted({s["zip"] for s in stations})
+        self.latencies = {op: [] for op in OPERATIONS}
+        self.acked_reports = 0
+        self.rejected_reports = 0
+        self.errors = 0
+
+    def is_broken(self, station_id):
+        if self.intake is not None:
+            return self.intake.is_station_broken(station_id)
+        return self.service.is_station_broken(station_id)
+
+    def search(self):
+        # Repository-backed ZIP lookup, as used by the API / CLI path
+        return self.station_service.get_stations_for_zip(self.rng.choice(self.zips))
+
+    def filter(self):
+        # "View All" followed by the status and company filters, as in app.py
+        display_list = []
+        for s in self.stations:
+            status = "Not Available" if self.is_broken(s["station_id"]) else "Available"
+            display_list.append(dict(s, status=status))
+        ops = sorted({s["operator"] for s in display_list})
+        selected = set(self.rng.sample(ops, k=max(1, len(ops) // 2)))
+        return [s for s in display_list if s["operator"] in selected]
+
+    def report(self):
+        station_id = self.rng.choice(self.report_pool)
+        issue = self.rng.choice(ISSUE_TYPES)
+        if self.intake is not None:
+            accepted = self.intake.submit(station_id, issue, self.session_id)
+        else:
+            self.service.report_malfunction(station_id, issue)
+            accepted = True
+        if accepted:
+            self.acked_reports += 1
+        else:
+            self.rejected_reports += 1
+
+    def resolve(self):
+        station_id = self.rng.choice(self.resolve_pool)
+        if self.intake is not None:
+            self.intake.resolve(station_id)
+        else:
+            self.service.resolve_malfunction(station_id)
+
+    def run(self, deadline: float, max_ops: int):
+        done = 0
+        while time.perf_counter() < deadline and (not max_ops or done < max_ops):
+            op = self.rng.choices(self.ops, weights=self.weights)[0]
+            started = time.perf_counter()
+            try:
+                getattr(self, op)()
+            except Exception:
+                self.errors += 1
+            self.latencies[op].append(time.perf_counter() - started)
+            done += 1
+        return self
+
+
+def run_worker(args: dict) -> dict:
+    """Runs `sessions` concurrent sessions in this process (thread per session)."""
+    stations = args["stations"]
+    report_pool, resolve_pool = split_pools(stations)
+    service, intake = make_store(args["backend"], args["data_path"])
+    repository = CsvChargingStationRepository(args["register"])
+    repository.load()  # before the clock starts
+    station_service = StationService(repository)
+    mix = args["mix"]
+    deadline = time.perf_counter() + args["duration"]
+
+    sessions = [
+        Session(f"p{args['worker']}-s{i}", stations, station_service, report_pool, resolve_pool, service, intake, mix,
+                random.Random(args["seed"] * 1000 + args["worker"] * 100 + i))
+        for i in range(args["sessions"])
+    ]
+    with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+        list(pool.map(lambda s: s.run(deadline, args["ops_per_session"]), sessions))
+    if intake is not None:
+        intake.flush()
+
+    latencies = {op: [] for op in OPERATIONS}
+    for s in sessions:
+        for op, values in s.latencies.items():
+            latencies[op].extend(values)
+    return {
+        "latencies": latencies,
+        "acked_reports": sum(s.acked_reports for s in sessions),
+        "rejected_reports": sum(s.rejected_reports for s in sessions),
+        "errors": sum(s.errors for s in sessions),
+    }
+
+
+# ---------- Reporting ----------
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank method
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results: list, elapsed: float, data_path: str, report_pool: list) -> dict:
+    latencies = {op: [] for op in OPERATIONS}
+    for r in results:
+        for op, values in r["latencies"].items():
+            latencies[op].extend(values)
+
+    operations = {}
+    for op, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        operations[op] = {
+            "count": len(values),
+            "throughput": round(len(values) / elapsed, 1),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+
+    acked = sum(r["acked_reports"] for r in results)
+    pool = set(report_pool)
+    stored = sum(r.get("count", 1) for r in MalfunctionService(data_path=data_path).get_all_reports()
+                 if r["station_id"] in pool)
+    total_ops = sum(o["count"] for o in operations.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total_ops": total_ops,
+        "throughput": round(total_ops / elapsed, 1) if elapsed else 0.0,
+        "operations": operations,
+        "acked_reports": acked,
+        "stored_reports": stored,
+        "lost_updates": max(acked - stored, 0),
+        "rejected_reports": sum(r["rejected_reports"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+    }
+
+
+def print_summary(summary: dict, options):
+    print(f"\n⚡ ChargeHub load test — backend={options.backend}, processes={options.processes}, "
+          f"sessions/process={options.sessions}")
+    print(f"{'operation':<10}{'count':>8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for op, o in summary["operations"].items():
+        print(f"{op:<10}{o['count']:>8}{o['throughput']:>10}{o['p50_ms']:>10}{o['p95_ms']:>10}{o['p99_ms']:>10}")
+    print(f"\nTotal: {summary['total_ops']} ops in {summary['elapsed_s']}s ({summary['throughput']} ops/s)")
+    print(f"Reports acknowledged: {summary['acked_reports']}, stored: {summary['stored_reports']}, "
+          f"lost updates: {summary['lost_updates']}, rejected: {summary['rejected_reports']}, errors: {summary['errors']}")
+
+
+# ---------- Entry ----------
+
+def check_data_path(data_path: str, overwrite: bool):
+    """Never clobber a store that holds reports (e.g. the live malfunctions.json)."""
+    if not os.path.exists(data_path):
+        return
+    if MalfunctionService(data_path=data_path).get_all_reports() and not overwrite:
+        raise FileExistsError(f"{data_path} already contains reports; pass --overwrite to replace them")
+    os.remove(data_path)
+
+
+def run(options) -> dict:
+    if options.data_path:
+        check_data_path(options.data_path, options.overwrite)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stations, register = load_stations(options.csv, options.stations, tmp_dir)
+        report_pool, resolve_pool = split_pools(stations)
+        data_path = options.data_path or os.path.join(tmp_dir, "malfunctions.json")
+        # Seed open reports on the resolve pool so resolves have work to do
+        MalfunctionService(data_path=data_path).merge_reports([
+            {"station_id": sid, "description": "No Power", "timestamp": "2025-01-01T00:00:00", "status": "Open"}
+            for sid in resolve_pool
+        ])
+
+        worker_args = [{
+            "worker": w, "stations": stations, "register": register, "backend": options.backend, "data_path": data_path,
+            "mix": options.mix, "sessions": options.sessions, "duration": options.duration,
+            "ops_per_session": options.ops, "seed": options.seed,
+        } for w in range(options.processes)]
+
+        started = time.perf_counter()
+        if options.processes == 1:
+            results = [run_worker(worker_args[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=options.processes) as pool:
+                results = list(pool.map(run_worker, worker_args))
+        elapsed = time.perf_counter() - started
+
+        return summarize(results, elapsed, data_path, report_pool)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simulate concurrent ChargeHub sessions against the local file store.")
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent sessions per process")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes (each with its own service instance)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--ops", type=int, default=0, help="max operations per session (0 = until duration)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--backend", choices=["direct", "intake"], default="direct",
+                        help="direct = MalfunctionService writes, intake = coalescing MalfunctionIntake")
+    parser.add_argument("--stations", type=int, default=500, help="synthetic register size when no CSV is given")
+    parser.add_argument("--csv", help="Ladesäulenregister CSV to load instead of synthetic stations")
+    parser.add_argument("--data-path", help="malfunction JSON to use (default: a temporary file)")
+    parser.add_argument("--overwrite", action="store_true", help="allow --data-path to point at a file that has reports")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    try:
+        summary = run(options)
+    except FileExistsError as e:
+        parser.error(str(e))
+    if options.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, options)
+    return summary
+
+
+if __name__ == "__main__":
+    main()